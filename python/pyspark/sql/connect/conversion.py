@@ -18,6 +18,8 @@
 import array
 import datetime
 import decimal
+import functools
+from distutils.version import LooseVersion
 
 import pyarrow as pa
 
@@ -41,6 +43,7 @@ from pyspark.sql.connect.types import to_arrow_schema
 from typing import (
     Any,
     Callable,
+    Optional,
     Sequence,
     List,
 )
@@ -52,110 +55,48 @@ class LocalDataToArrowConversion:
     Currently, only :class:`SparkSession` in Spark Connect can use this class.
     """
 
-    @staticmethod
-    def _need_converter(dataType: DataType) -> bool:
-        if isinstance(dataType, NullType):
-            return True
-        elif isinstance(dataType, StructType):
-            # Struct maybe rows, should convert to dict.
-            return True
-        elif isinstance(dataType, ArrayType):
-            return LocalDataToArrowConversion._need_converter(dataType.elementType)
-        elif isinstance(dataType, MapType):
+    # Data types whose values always need a converter, checked by exact type.
+    _ALWAYS_NEED_CONVERTER = frozenset(
+        [
+            NullType,
+            # Struct maybe rows, should split into the columns of its fields.
+            StructType,
             # Different from PySpark, here always needs conversion,
-            # since an Arrow Map requires a list of tuples.
-            return True
-        elif isinstance(dataType, BinaryType):
-            return True
-        elif isinstance(dataType, (TimestampType, TimestampNTZType)):
+            # since an Arrow Map is built from the flattened keys and items.
+            MapType,
+            BinaryType,
             # Always truncate
-            return True
-        elif isinstance(dataType, DecimalType):
+            TimestampType,
             # Convert Decimal('NaN') to None
-            return True
-        elif isinstance(dataType, StringType):
+            DecimalType,
             # Coercion to StringType is allowed
+            StringType,
+        ]
+    )
+
+    @staticmethod
+    def _need_converter(dataType: DataType) -> bool:
+        if type(dataType) in LocalDataToArrowConversion._ALWAYS_NEED_CONVERTER:
             return True
+        elif isinstance(dataType, ArrayType):
+            return LocalDataToArrowConversion._need_converter(dataType.elementType)
         else:
             return False
 
     @staticmethod
-    def _create_converter(dataType: DataType) -> Callable:
+    def _create_converter(dataType: DataType) -> Optional[Callable]:
+        # Returns None if the values can be used as they are.
         assert dataType is not None and isinstance(dataType, DataType)
 
         if not LocalDataToArrowConversion._need_converter(dataType):
-            return lambda value: value
+            return None
+
+        # The nested types are built from their children in _convert_to_array.
+        assert not isinstance(dataType, (StructType, ArrayType, MapType)), dataType
 
         if isinstance(dataType, NullType):
             return lambda value: None
 
-        elif isinstance(dataType, StructType):
-
-            field_names = dataType.fieldNames()
-
-            field_convs = {
-                field.name: LocalDataToArrowConversion._create_converter(field.dataType)
-                for field in dataType.fields
-            }
-
-            def convert_struct(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, (tuple, dict)), f"{type(value)} {value}"
-
-                    _dict = {}
-                    if isinstance(value, dict):
-                        for k, v in value.items():
-                            assert isinstance(k, str)
-                            _dict[k] = field_convs[k](v)
-                    elif isinstance(value, Row) and hasattr(value, "__fields__"):
-                        for k, v in value.asDict(recursive=False).items():
-                            assert isinstance(k, str)
-                            _dict[k] = field_convs[k](v)
-                    else:
-                        i = 0
-                        for v in value:
-                            field_name = field_names[i]
-                            _dict[field_name] = field_convs[field_name](v)
-                            i += 1
-
-                    return _dict
-
-            return convert_struct
-
-        elif isinstance(dataType, ArrayType):
-
-            element_conv = LocalDataToArrowConversion._create_converter(dataType.elementType)
-
-            def convert_array(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, (list, array.array))
-                    return [element_conv(v) for v in value]
-
-            return convert_array
-
-        elif isinstance(dataType, MapType):
-
-            key_conv = LocalDataToArrowConversion._create_converter(dataType.keyType)
-            value_conv = LocalDataToArrowConversion._create_converter(dataType.valueType)
-
-            def convert_map(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, dict)
-
-                    _tuples = []
-                    for k, v in value.items():
-                        _tuples.append((key_conv(k), value_conv(v)))
-
-                    return _tuples
-
-            return convert_map
-
         elif isinstance(dataType, BinaryType):
 
             def convert_binary(value: Any) -> Any:
@@ -167,7 +108,7 @@ class LocalDataToArrowConversion:
 
             return convert_binary
 
-        elif isinstance(dataType, (TimestampType, TimestampNTZType)):
+        elif isinstance(dataType, TimestampType):
 
             def convert_timestample(value: Any) -> Any:
                 if value is None:
@@ -194,6 +135,9 @@ class LocalDataToArrowConversion:
             def convert_string(value: Any) -> Any:
                 if value is None:
                     return None
+                elif type(value) is str:
+                    # Fast path for the most common input, which needs no coercion
+                    return value
                 else:
                     # only atomic types are supported
                     assert isinstance(
@@ -222,44 +166,148 @@ class LocalDataToArrowConversion:
 
         else:
 
-            return lambda value: value
+            return None
 
     @staticmethod
-    def convert(data: Sequence[Any], schema: StructType) -> "pa.Table":
-        assert isinstance(data, list) and len(data) > 0
+    def _convert_to_arrays(
+        data: Sequence[Any], schema: StructType, pa_fields: Sequence["pa.Field"]
+    ) -> List["pa.Array"]:
+        """
+        Convert struct-like values (dicts, Rows or tuples) to one Arrow array per field
+        of the schema, None values are converted to nulls in every field.
+        """
+        column_names = schema.fieldNames()
 
-        assert schema is not None and isinstance(schema, StructType)
+        column_indices = {name: j for j, name in enumerate(column_names)}
+
+        # Split the values into columns rather than building a dict per value, so
+        # that Arrow does not have to pivot them into columnar buffers again.
+        # Missing values (e.g. absent dict keys) are left as None.
+        columns: List[List[Any]] = [[None] * len(data) for _ in column_names]
+
+        for i, item in enumerate(data):
+            item_type = type(item)
+            if item_type is tuple or item_type is list:
+                # Plain tuples and lists are the most common input, check the exact
+                # type first instead of going through the isinstance checks below.
+                for j, value in enumerate(item):
+                    columns[j][i] = value
+            elif item is None:
+                continue
+            elif isinstance(item, dict):
+                for col, value in item.items():
+                    columns[column_indices[col]][i] = value
+            elif isinstance(item, Row) and hasattr(item, "__fields__"):
+                for col, value in zip(item.__fields__, item):
+                    columns[column_indices[col]][i] = value
+            else:
+                assert isinstance(item, (tuple, list)), f"{type(item)} {item}"
+                for j, value in enumerate(item):
+                    columns[j][i] = value
 
-        pa_schema = to_arrow_schema(schema)
+        return [
+            LocalDataToArrowConversion._convert_to_array(
+                columns[j], field.dataType, pa_fields[j].type
+            )
+            for j, field in enumerate(schema.fields)
+        ]
 
-        column_names = schema.fieldNames()
+    @staticmethod
+    def _convert_to_array(
+        data: List[Any], dataType: DataType, pa_type: "pa.DataType"
+    ) -> "pa.Array":
+        """
+        Convert the values of a column to an Arrow array. Structs, maps and arrays whose
+        elements need conversion are built from the arrays of their children, the other
+        types are converted value by value.
+        """
+        if isinstance(dataType, StructType):
+            pa_fields = [pa_type[k] for k in range(pa_type.num_fields)]
+            children = LocalDataToArrowConversion._convert_to_arrays(data, dataType, pa_fields)
+            if LooseVersion(pa.__version__) < LooseVersion("5.0.0"):
+                # StructArray.from_arrays does not support mask before pyarrow 5.0.0.
+                values = [child.to_pylist() for child in children]
+                return pa.array(
+                    [
+                        None
+                        if value is None
+                        else {f.name: column[i] for f, column in zip(pa_fields, values)}
+                        for i, value in enumerate(data)
+                    ],
+                    type=pa_type,
+                )
+            mask = pa.array([value is None for value in data], type=pa.bool_())
+            return pa.StructArray.from_arrays(children, fields=pa_fields, mask=mask)
 
-        column_convs = {
-            field.name: LocalDataToArrowConversion._create_converter(field.dataType)
-            for field in schema.fields
-        }
+        elif isinstance(dataType, MapType):
+            # Collect the keys and the items of all the maps in two flat lists, instead
+            # of a list of (key, item) tuples per map. A null offset marks a null map.
+            offsets: List[Optional[int]] = []
+            keys: List[Any] = []
+            items: List[Any] = []
+            for value in data:
+                if value is None:
+                    offsets.append(None)
+                else:
+                    assert isinstance(value, dict)
+                    offsets.append(len(keys))
+                    keys.extend(value.keys())
+                    items.extend(value.values())
+            offsets.append(len(keys))
+
+            return pa.MapArray.from_arrays(
+                pa.array(offsets, type=pa.int32()),
+                LocalDataToArrowConversion._convert_to_array(
+                    keys, dataType.keyType, pa_type.key_type
+                ),
+                LocalDataToArrowConversion._convert_to_array(
+                    items, dataType.valueType, pa_type.item_type
+                ),
+            )
 
-        pylist = []
+        elif isinstance(dataType, ArrayType) and LocalDataToArrowConversion._need_converter(
+            dataType.elementType
+        ):
+            # Collect the elements of all the arrays in one flat list, so that they are
+            # converted as a single column. A null offset marks a null array.
+            offsets = []
+            elements: List[Any] = []
+            for value in data:
+                if value is None:
+                    offsets.append(None)
+                else:
+                    assert isinstance(value, (list, array.array))
+                    offsets.append(len(elements))
+                    elements.extend(value)
+            offsets.append(len(elements))
+
+            return pa.ListArray.from_arrays(
+                pa.array(offsets, type=pa.int32()),
+                LocalDataToArrowConversion._convert_to_array(
+                    elements, dataType.elementType, pa_type.value_type
+                ),
+            )
 
-        for item in data:
-            _dict = {}
+        else:
+            conv = LocalDataToArrowConversion._create_converter(dataType)
+            if conv is not None:
+                data = [conv(value) for value in data]
+            return pa.array(data, type=pa_type)
 
-            if isinstance(item, dict):
-                for col, value in item.items():
-                    _dict[col] = column_convs[col](value)
-            elif isinstance(item, Row) and hasattr(item, "__fields__"):
-                for col, value in item.asDict(recursive=False).items():
-                    _dict[col] = column_convs[col](value)
-            else:
-                i = 0
-                for value in item:
-                    col = column_names[i]
-                    _dict[col] = column_convs[col](value)
-                    i += 1
+    @staticmethod
+    def convert(data: Sequence[Any], schema: StructType) -> "pa.Table":
+        assert isinstance(data, list) and len(data) > 0
+
+        assert schema is not None and isinstance(schema, StructType)
+
+        # Only nested structs can be None, the rows themselves can not.
+        assert all(item is not None for item in data)
+
+        pa_schema = to_arrow_schema(schema)
 
-            pylist.append(_dict)
+        pa_arrays = LocalDataToArrowConversion._convert_to_arrays(data, schema, list(pa_schema))
 
-        return pa.Table.from_pylist(pylist, schema=pa_schema)
+        return pa.Table.from_arrays(pa_arrays, schema=pa_schema)
 
 
 class ArrowTableToRowsConversion:
@@ -268,32 +316,39 @@ class ArrowTableToRowsConversion:
     Currently, only :class:`DataFrame` in Spark Connect can use this class.
     """
 
+    # Data types whose values always need a converter.
+    _ALWAYS_NEED_CONVERTER = frozenset(
+        [
+            NullType,
+            StructType,
+            # Different from PySpark, here always needs conversion,
+            # since the input from Arrow is a list of tuples.
+            MapType,
+            BinaryType,
+            # Always remove the time zone info for now
+            TimestampType,
+            TimestampNTZType,
+        ]
+    )
+
     @staticmethod
     def _need_converter(dataType: DataType) -> bool:
-        if isinstance(dataType, NullType):
-            return True
-        elif isinstance(dataType, StructType):
+        if type(dataType) in ArrowTableToRowsConversion._ALWAYS_NEED_CONVERTER:
             return True
         elif isinstance(dataType, ArrayType):
             return ArrowTableToRowsConversion._need_converter(dataType.elementType)
-        elif isinstance(dataType, MapType):
-            # Different from PySpark, here always needs conversion,
-            # since the input from Arrow is a list of tuples.
-            return True
-        elif isinstance(dataType, BinaryType):
-            return True
-        elif isinstance(dataType, (TimestampType, TimestampNTZType)):
-            # Always remove the time zone info for now
-            return True
         else:
             return False
 
     @staticmethod
-    def _create_converter(dataType: DataType) -> Callable:
+    @functools.lru_cache(maxsize=256)
+    def _create_converter(dataType: DataType) -> Optional[Callable]:
+        # Returns None if the values can be used as they are. The converters are stateless
+        # and cached by data type, and do not check the values, which come from pyarrow.
         assert dataType is not None and isinstance(dataType, DataType)
 
         if not ArrowTableToRowsConversion._need_converter(dataType):
-            return lambda value: value
+            return None
 
         if isinstance(dataType, NullType):
             return lambda value: None
@@ -307,34 +362,39 @@ class ArrowTableToRowsConversion:
             need_conv = any(
                 ArrowTableToRowsConversion._need_converter(f.dataType) for f in dataType.fields
             )
+            # A tuple, since the cached converter shares it as __fields__ across calls.
+            field_names = tuple(dataType.fieldNames())
+            # The dicts from Arrow only keep one value for duplicated field names.
+            unique_names = len(set(field_names)) == len(field_names)
 
-            def convert_struct(value: Any) -> Row:
+            def convert_struct(value: Any) -> Optional[Row]:
                 if value is None:
-                    return Row()
+                    return None
+                elif need_conv:
+                    _dict = {}
+                    for k, v in value.items():
+                        conv = field_convs[k]
+                        _dict[k] = v if conv is None else conv(v)
+                    return Row(**_dict)
+                elif unique_names:
+                    return _create_row(fields=field_names, values=tuple(value.values()))
                 else:
-                    assert isinstance(value, dict)
-
-                    if need_conv:
-                        _dict = {}
-                        for k, v in value.items():
-                            assert isinstance(k, str)
-                            _dict[k] = field_convs[k](v)
-                        return Row(**_dict)
-                    else:
-                        return Row(**value)
+                    return _create_row(fields=list(value.keys()), values=list(value.values()))
 
             return convert_struct
 
         elif isinstance(dataType, ArrayType):
 
+            # The array only needs a converter if its elements do.
             element_conv = ArrowTableToRowsConversion._create_converter(dataType.elementType)
+            assert element_conv is not None
+            convert_element: Callable = element_conv
 
             def convert_array(value: Any) -> Any:
                 if value is None:
                     return None
                 else:
-                    assert isinstance(value, list)
-                    return [element_conv(v) for v in value]
+                    return [convert_element(v) for v in value]
 
             return convert_array
 
@@ -347,9 +407,13 @@ class ArrowTableToRowsConversion:
                 if value is None:
                     return None
                 else:
-                    assert isinstance(value, list)
-                    assert all(isinstance(t, tuple) and len(t) == 2 for t in value)
-                    return dict((key_conv(t[0]), value_conv(t[1])) for t in value)
+                    return dict(
+                        (
+                            t[0] if key_conv is None else key_conv(t[0]),
+                            t[1] if value_conv is None else value_conv(t[1]),
+                        )
+                        for t in value
+                    )
 
             return convert_map
 
@@ -359,7 +423,8 @@ class ArrowTableToRowsConversion:
                 if value is None:
                     return None
                 else:
-                    assert isinstance(value, bytes)
+                    # Keep the copy into a bytearray, to match the PySpark which
+                    # returns bytearray for BinaryType in collected Rows.
                     return bytearray(value)
 
             return convert_binary
@@ -370,7 +435,6 @@ class ArrowTableToRowsConversion:
                 if value is None:
                     return None
                 else:
-                    assert isinstance(value, datetime.datetime)
                     if value.tzinfo is not None:
                         # always remove the time zone for now
                         return value.replace(tzinfo=None)
@@ -381,7 +445,21 @@ class ArrowTableToRowsConversion:
 
         else:
 
-            return lambda value: value
+            return None
+
+    @staticmethod
+    def _column_to_pylist(column: "pa.ChunkedArray") -> List[Any]:
+        if column.null_count == 0 and (
+            pa.types.is_integer(column.type)
+            or pa.types.is_float32(column.type)
+            or pa.types.is_float64(column.type)
+            or pa.types.is_boolean(column.type)
+        ):
+            # Without nulls, going through NumPy is faster than to_pylist for the
+            # numeric and boolean columns, and gives the same Python objects.
+            return column.to_numpy().tolist()
+        else:
+            return column.to_pylist()
 
     @staticmethod
     def convert(table: "pa.Table", schema: StructType) -> List[Row]:
@@ -396,10 +474,18 @@ class ArrowTableToRowsConversion:
         # table.to_pylist() automatically remove columns with duplicated names,
         # to avoid this, use columnar lists here.
         # TODO: support duplicated field names in the one struct. e.g. SF.struct("a", "a")
-        columnar_data = [column.to_pylist() for column in table.columns]
+        columnar_data = [
+            ArrowTableToRowsConversion._column_to_pylist(column) for column in table.columns
+        ]
+
+        # Apply the converters column by column, so that each cell is visited once
+        # in columnar order, and then zip the columns into rows.
+        for j, conv in enumerate(field_converters):
+            if conv is not None:
+                columnar_data[j] = [conv(v) for v in columnar_data[j]]
+
+        fields = table.column_names
+        if len(columnar_data) == 0:
+            return [_create_row(fields=fields, values=()) for _ in range(0, table.num_rows)]
 
-        rows: List[Row] = []
-        for i in range(0, table.num_rows):
-            values = [field_converters[j](columnar_data[j][i]) for j in range(0, table.num_columns)]
-            rows.append(_create_row(fields=table.column_names, values=values))
-        return rows
+        return [_create_row(fields=fields, values=values) for values in zip(*columnar_data)]
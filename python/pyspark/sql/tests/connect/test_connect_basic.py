@@ -35,6 +35,7 @@ from pyspark.sql.types import (
     IntegerType,
     MapType,
     ArrayType,
+    TimestampNTZType,
     Row,
 )
 from pyspark.testing.connectutils import (
@@ -56,6 +57,7 @@ if should_test_connect:
     from pyspark.sql.connect.session import SparkSession as RemoteSparkSession
     from pyspark.sql.connect.client import ChannelBuilder
     from pyspark.sql.connect.column import Column
+    from pyspark.sql.connect.conversion import LocalDataToArrowConversion
     from pyspark.sql.dataframe import DataFrame
     from pyspark.sql.connect.dataframe import DataFrame as CDataFrame
     from pyspark.sql.connect.function_builder import udf
@@ -708,6 +710,26 @@ class SparkConnectBasicTests(SparkConnectSQLTestCase):
         self.assertEqual(cdf.schema, sdf.schema)
         self.assertEqual(cdf.collect(), sdf.collect())
 
+    def test_timestamp_ntz_create_from_rows(self):
+        # The 'val' field is None, so the schema can not be inferred from the data,
+        # and the timestamps are converted as TimestampNTZType.
+        data = [(datetime.datetime(2016, 3, 11, 9, 0, 7), None)]
+        schema = StructType(
+            [StructField("date", TimestampNTZType()), StructField("val", IntegerType())]
+        )
+
+        cdf = self.connect.createDataFrame(data, schema)
+        sdf = self.spark.createDataFrame(data, schema)
+
+        self.assertEqual(cdf.schema, sdf.schema)
+        self.assertEqual(cdf.collect(), sdf.collect())
+
+        # The wall-clock time is kept as it is, whatever the local timezone.
+        table = LocalDataToArrowConversion.convert(data, schema)
+        self.assertEqual(
+            table.column("date").to_pylist(), [datetime.datetime(2016, 3, 11, 9, 0, 7)]
+        )
+
     def test_create_dataframe_with_coercion(self):
         data1 = [[1.33, 1], ["2.1", 1]]
         data2 = [[True, 1], ["false", 1]]
@@ -839,6 +861,129 @@ class SparkConnectBasicTests(SparkConnectSQLTestCase):
             self.assertEqual(cdf.schema, sdf.schema)
             self.assertEqual(cdf.collect(), sdf.collect())
 
+    def test_struct_type_create_from_rows(self):
+        schema = StructType(
+            [
+                StructField("a", LongType()),
+                StructField(
+                    "b",
+                    StructType(
+                        [
+                            StructField("x", LongType(), False),
+                            StructField("y", StringType(), False),
+                            StructField(
+                                "z",
+                                StructType(
+                                    [
+                                        StructField("p", LongType()),
+                                        StructField(
+                                            "q", StructType([StructField("r", StringType())])
+                                        ),
+                                    ]
+                                ),
+                            ),
+                        ]
+                    ),
+                ),
+            ]
+        )
+
+        # The 'r' field is always None, so the schema can not be fully inferred from
+        # the data, and the given schema is used for the conversion.
+        data = [
+            (1, None),
+            (2, Row(x=1, y="y", z=None)),
+            (3, Row(x=2, y="row", z=Row(p=3, q=None))),
+            (4, Row(x=3, y="nested", z=Row(p=None, q=Row(r=None)))),
+            (5, None),
+        ]
+
+        cdf = self.connect.createDataFrame(data, schema)
+        sdf = self.spark.createDataFrame(data, schema)
+
+        self.assertEqual(cdf.schema, sdf.schema)
+        self.assertEqual(cdf.collect(), sdf.collect())
+
+    def test_struct_type_local_data_to_arrow(self):
+        schema = StructType(
+            [
+                StructField("a", LongType()),
+                StructField(
+                    "b", StructType([StructField("x", LongType()), StructField("y", StringType())])
+                ),
+            ]
+        )
+
+        data = [(1, [2, "list"]), (2, None), (3, (4, "tuple")), (4, {"y": "dict"})]
+
+        table = LocalDataToArrowConversion.convert(data, schema)
+
+        self.assertEqual(
+            table.to_pylist(),
+            [
+                {"a": 1, "b": {"x": 2, "y": "list"}},
+                {"a": 2, "b": None},
+                {"a": 3, "b": {"x": 4, "y": "tuple"}},
+                {"a": 4, "b": {"x": None, "y": "dict"}},
+            ],
+        )
+
+    def test_map_type_create_from_rows(self):
+        schema = StructType(
+            [
+                StructField("a", MapType(StringType(), LongType())),
+                StructField(
+                    "b",
+                    MapType(
+                        StringType(),
+                        StructType([StructField("x", LongType()), StructField("y", StringType())]),
+                    ),
+                ),
+            ]
+        )
+
+        data = [
+            (None, None),
+            ({"k1": 1, "k2": None}, {"k1": Row(x=1, y="y"), "k2": None}),
+            (None, None),
+            ({}, {"k3": (2, None), "k4": {"x": 3, "y": "z"}}),
+            (None, None),
+        ]
+
+        cdf = self.connect.createDataFrame(data, schema)
+        sdf = self.spark.createDataFrame(data, schema)
+
+        self.assertEqual(cdf.schema, sdf.schema)
+        self.assertEqual(cdf.collect(), sdf.collect())
+
+    def test_array_type_create_from_rows(self):
+        schema = StructType(
+            [
+                StructField(
+                    "a",
+                    ArrayType(
+                        StructType([StructField("x", LongType()), StructField("y", StringType())])
+                    ),
+                ),
+                StructField("b", ArrayType(ArrayType(StringType()))),
+                StructField("c", ArrayType(MapType(StringType(), LongType()))),
+            ]
+        )
+
+        data = [
+            (None, None, None),
+            ([Row(x=1, y="y"), None, (2, None)], [["a", None], None, []], [{"k": 1}, None, {}]),
+            (None, None, None),
+            ([], [[], ["b"]], [{"k": None, "l": 2}]),
+            (None, None, None),
+        ]
+
+        cdf = self.connect.createDataFrame(data, schema)
+        sdf = self.spark.createDataFrame(data, schema)
+
+        self.assertEqual(cdf.schema, sdf.schema)
+        self.assertEqual(cdf.collect(), sdf.collect())
+
     def test_simple_explain_string(self):
         df = self.connect.read.table(self.tbl_name).limit(10)
         result = df._explain_string()
@@ -2545,6 +2690,17 @@ class SparkConnectBasicTests(SparkConnectSQLTestCase):
             ).collect(),
         )
 
+    def test_collect_null_struct(self):
+        query = """
+            SELECT
+            CAST(NULL AS STRUCT<a: INT>) AS a,
+            ARRAY(NAMED_STRUCT('x', 1), CAST(NULL AS STRUCT<x: INT>)) AS b,
+            MAP(1, CAST(NULL AS STRUCT<y: STRING>)) AS c,
+            NAMED_STRUCT('z', CAST(NULL AS STRUCT<w: BINARY>)) AS d
+            """
+
+        self.assertEqual(self.connect.sql(query).collect(), self.spark.sql(query).collect())
+
     def test_unsupported_functions(self):
         # SPARK-41225: Disable unsupported functions.
         df = self.connect.read.table(self.tbl_name)
@@ -2011,10 +2011,12 @@ def _create_row_inbound_converter(dataType: DataType) -> Callable:
 
 
 def _create_row(
-    fields: Union["Row", List[str]], values: Union[Tuple[Any, ...], List[Any]]
+    fields: Union["Row", List[str], Tuple[str, ...]], values: Union[Tuple[Any, ...], List[Any]]
 ) -> "Row":
-    row = Row(*values)
-    row.__fields__ = fields
+    # Same as Row(*values) with __fields__ set, but skips the Python-level
+    # Row.__new__ and Row.__setattr__ calls, since this is called for every row.
+    row = tuple.__new__(Row, values)
+    object.__setattr__(row, "__fields__", fields)
     return row
 
 